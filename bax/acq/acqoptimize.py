@@ -93,5 +93,5 @@ class AcqOptimizer(Base):
 
     def set_print_params(self):
         """Set self.print_params."""
-        self.print_params = copy.deepcopy(self.params)
+        super().set_print_params()
         delattr(self.print_params, "x_batch")
@@ -4,15 +4,36 @@ Algorithms for BAX.
 
 from argparse import Namespace
 import copy
+import functools
 import numpy as np
 from abc import ABC, abstractmethod
 
 from ..util.base import Base
-from ..util.misc_util import dict_to_namespace
-from ..util.domain_util import unif_random_sample_domain
+from ..util.misc_util import dict_to_namespace, is_numba_function
+from ..util.domain_util import unif_random_sample_domain, linspace_column
 from ..util.graph import jaccard_similarity
 
 
+def cache_output(get_output):
+    """
+    Decorator for Algorithm.get_output that memoizes the output for the current
+    execution path, and only recomputes it if self.exe_path is replaced or grows.
+    """
+
+    @functools.wraps(get_output)
+    def get_output_cached(self):
+        cache = getattr(self, "output_cache", None)
+        len_path = len(self.exe_path.y)
+        if cache is not None and cache[0] is self.exe_path and cache[1] == len_path:
+            return cache[2]
+
+        output = get_output(self)
+        self.output_cache = (self.exe_path, len_path, output)
+        return output
+
+    return get_output_cached
+
+
 class Algorithm(ABC, Base):
     """Base class for a BAX Algorithm"""
 
@@ -69,8 +90,17 @@ class Algorithm(ABC, Base):
         return self.exe_path
 
     def get_copy(self):
-        """Return a copy of this algorithm."""
-        return copy.deepcopy(self)
+        """
+        Return a copy of this algorithm. The copy gets its own params Namespace and
+        execution path, but shares parameter values (e.g. x_path) with this algorithm,
+        which are treated as read-only.
+        """
+        algo_copy = copy.copy(self)
+        algo_copy.params = Namespace(**vars(self.params))
+        if hasattr(self, "exe_path"):
+            exe_path = self.exe_path
+            algo_copy.exe_path = Namespace(x=list(exe_path.x), y=list(exe_path.y))
+        return algo_copy
 
     @abstractmethod
     def get_output(self):
@@ -100,7 +130,17 @@ class FixedPathAlgorithm(Algorithm):
         params = dict_to_namespace(params)
 
         self.params.name = getattr(params, "name", "FixedPathAlgorithm")
-        self.params.x_path = getattr(params, "x_path", [])
+
+        # Store x_path as an array with one row per input
+        x_path = np.asarray(getattr(params, "x_path", []), dtype=np.float64)
+        if x_path.ndim == 1:
+            x_path = x_path.reshape(-1, 1)
+        self.params.x_path = x_path
+
+    def initialize(self):
+        """Initialize algorithm, reset execution path and cache length of x_path."""
+        super().initialize()
+        self.len_x_path = len(self.params.x_path)
 
     def get_next_x(self):
         """
@@ -108,10 +148,98 @@ class FixedPathAlgorithm(Algorithm):
         the algorithm is complete, return None.
         """
         len_path = len(self.exe_path.x)
-        x_path = self.params.x_path
-        next_x = x_path[len_path] if len_path < len(x_path) else None
+        next_x = self.params.x_path[len_path] if len_path < self.len_x_path else None
         return next_x
 
+    def run_algorithm_on_f(self, f):
+        """
+        Run the algorithm by sequentially querying function f. Return the execution path
+        and output. If f is a Numba-compiled function returning a scalar, run the
+        compiled loop from numba_kernels.
+        """
+        self.initialize()
+
+        # Query f on each x in x_path. Outputs are kept as returned by f (e.g. arrays
+        # from FunctionSample), except from the compiled loop, which returns floats.
+        x_path = self.params.x_path
+        y_list = None
+        if is_numba_function(f):
+            from numba.core.errors import TypingError
+            from .numba_kernels import fixed_path_scan
+
+            # Fall back to the Python loop if the kernel can't be compiled for f
+            # (e.g. if f returns an array)
+            y_buf = np.empty(self.len_x_path)
+            try:
+                fixed_path_scan(f, x_path, y_buf)
+                y_list = y_buf.tolist()
+            except TypingError:
+                pass
+
+        if y_list is None:
+            y_list = [f(x) for x in x_path]
+
+        # Set execution path once at the end
+        self.exe_path.x = list(x_path)
+        self.exe_path.y = y_list
+
+        # Return execution path and output
+        return self.exe_path, self.get_output()
+
+    def batch_run_algorithm_on_f(self, f):
+        """
+        Run the algorithm by querying function f once on the full x_path, where f
+        accepts an array of inputs and returns a sequence with one output per input.
+        Return the execution path and output.
+        """
+        self.initialize()
+
+        xs = self.params.x_path
+        ys = list(f(xs))
+        if len(ys) != len(xs):
+            raise ValueError(f"f returned {len(ys)} outputs for {len(xs)} inputs.")
+        self.exe_path.x = list(xs)
+        self.exe_path.y = ys
+
+        # Return execution path and output
+        return self.exe_path, self.get_output()
+
+    def run_algorithm_on_fs(self, fs, n_f):
+        """
+        Run the algorithm on n_f functions, where fs(x_path) returns an array with shape
+        (n_f, len(x_path)) of each function's values on x_path. If fs is a
+        Numba-compiled function, it is instead called as fs(b, x) to return the value
+        of function b at input x, in parallel over functions. Return the lists of
+        execution paths and outputs.
+        """
+        x_path = self.params.x_path
+        if is_numba_function(fs):
+            from .numba_kernels import fixed_path_scan_batch
+
+            y_arr = np.empty((n_f, len(x_path)))
+            fixed_path_scan_batch(fs, x_path, y_arr)
+        else:
+            y_arr = np.asarray(fs(x_path), dtype=np.float64).reshape(n_f, len(x_path))
+
+        return self.get_exe_path_and_output_lists([x_path] * n_f, y_arr.tolist())
+
+    def get_exe_path_and_output_lists(self, x_path_list, y_list_list):
+        """
+        Return the lists of execution paths and outputs for a set of functions, where
+        each function's outputs on the respective x_path in x_path_list are given by
+        the respective list in y_list_list.
+        """
+        exe_path_list = []
+        output_list = []
+        for x_path, y_list in zip(x_path_list, y_list_list):
+            self.initialize()
+            self.exe_path.x = list(x_path)
+            self.exe_path.y = y_list
+            exe_path_list.append(self.exe_path)
+            output_list.append(self.get_output())
+
+        return exe_path_list, output_list
+
     def get_output(self):
         """Return output based on self.exe_path."""
         # Default behavior: return execution path
@@ -136,6 +264,56 @@ class LinearScan(FixedPathAlgorithm):
 
         self.params.name = getattr(params, "name", "LinearScan")
 
+    @classmethod
+    def specialize(cls, x_path, max_len=32):
+        """
+        Return a subclass of cls specialized to a fixed x_path, whose run_algorithm_on_f
+        is generated code that queries f once per point in straight-line code, without
+        a loop. Instances of the subclass always use this x_path, and raise a ValueError
+        if given a different one. If x_path has at least max_len points, return cls
+        unchanged.
+        """
+        x_path = np.asarray(x_path, dtype=np.float64)
+        if x_path.ndim == 1:
+            x_path = x_path.reshape(-1, 1)
+        if len(x_path) >= max_len:
+            return cls
+
+        # Generate source for run_algorithm_on_f, with each x bound to its own name
+        x_names = [f"x_{i}" for i in range(len(x_path))]
+        y_str = ", ".join(f"f({x_name})" for x_name in x_names)
+        src = (
+            "def run_algorithm_on_f(self, f):\n"
+            "    self.initialize()\n"
+            "    self.exe_path.x = list(x_path)\n"
+            f"    self.exe_path.y = [{y_str}]\n"
+            "    return self.exe_path, self.get_output()\n"
+        )
+        namespace = dict(zip(x_names, x_path))
+        namespace["x_path"] = x_path
+        exec(src, namespace)
+
+        def set_params(self, params):
+            """Set self.params, the parameters for the algorithm."""
+            super(spec_cls, self).set_params(params)
+            params = dict_to_namespace(params)
+
+            if hasattr(params, "x_path") and not np.array_equal(
+                self.params.x_path, x_path
+            ):
+                raise ValueError("x_path must match the specialized x_path.")
+            self.params.x_path = x_path
+
+        spec_cls = type(
+            f"{cls.__name__}_N{len(x_path)}",
+            (cls,),
+            {
+                "set_params": set_params,
+                "run_algorithm_on_f": namespace["run_algorithm_on_f"],
+            },
+        )
+        return spec_cls
+
     def get_output(self):
         """Return algorithm output given the execution path."""
         return self.exe_path.y
@@ -154,30 +332,84 @@ class LinearScanRandGap(LinearScan):
         params = dict_to_namespace(params)
 
         self.params.name = getattr(params, "name", "LinearScanRandGap")
-        self.params.x_path_orig = copy.deepcopy(self.params.x_path)
+
+        # Cache bounds (None for an empty grid) and size of the original grid
+        x_path = self.params.x_path
+        self.n_grid = len(x_path)
+        self.min_x_path = float(x_path.min()) if self.n_grid else None
+        self.max_x_path = float(x_path.max()) if self.n_grid else None
+
+        # Cache range of the randomly drawn number of grid points
+        rand_factor = 0.2
+        self.min_gap = int(np.ceil((1 - rand_factor) * self.n_grid))
+        self.max_gap = int(np.ceil((1 + rand_factor) * self.n_grid))
+
+    @classmethod
+    def specialize(cls, x_path, max_len=32):
+        """Raise an error, since the x_path of this algorithm changes on each run."""
+        raise ValueError(f"{cls.__name__} draws a new x_path on each run.")
+
+    def draw_n_grid(self, size=None):
+        """Draw a random number of grid points (or an array of size numbers)."""
+        return np.random.randint(self.min_gap, self.max_gap, size=size)
+
+    def set_rand_x_path(self):
+        """Set self.params.x_path to a grid with a randomly drawn number of points."""
+        new_n_grid = self.draw_n_grid()
+        new_x_path = linspace_column(self.min_x_path, self.max_x_path, int(new_n_grid))
+        self.params.x_path = new_x_path
 
     def run_algorithm_on_f(self, f):
         """
         Run the algorithm by sequentially querying function f. Return the execution path
         and output.
         """
-        x_path = copy.deepcopy(self.params.x_path_orig)
-        n_grid = len(x_path)
-        rand_factor = 0.2
-        min_gap = np.ceil((1 - rand_factor) * n_grid)
-        max_gap = np.ceil((1 + rand_factor) * n_grid)
-        new_n_grid = np.random.randint(min_gap, max_gap)
-        min_x_path = np.min(x_path)
-        max_x_path = np.max(x_path)
-        new_x_path = [[x] for x in np.linspace(min_x_path, max_x_path, new_n_grid)]
-        self.params.x_path = new_x_path
-
+        self.set_rand_x_path()
         return super().run_algorithm_on_f(f)
 
-    def set_print_params(self):
-        """Set self.print_params."""
-        super().set_print_params()
-        delattr(self.print_params, "x_path_orig")
+    def batch_run_algorithm_on_f(self, f):
+        """
+        Run the algorithm by querying function f once on the full x_path, where f
+        accepts an array of inputs and returns an array of outputs. Return the execution
+        path and output.
+        """
+        self.set_rand_x_path()
+        return super().batch_run_algorithm_on_f(f)
+
+    def run_algorithm_on_fs(self, fs, n_f):
+        """
+        Run the algorithm on n_f functions, all scanned over one randomly drawn grid.
+        See FixedPathAlgorithm.run_algorithm_on_fs.
+        """
+        self.set_rand_x_path()
+        return super().run_algorithm_on_fs(fs, n_f)
+
+    def run_algorithm_on_f_batch(self, f_list, n_f):
+        """
+        Run the algorithm on n_f functions at once by querying f_list, which calls a
+        list of n_f functions given an x_list of n_f inputs (with None for functions
+        whose execution is complete). Each function is scanned over its own randomly
+        drawn grid. Return the lists of execution paths and outputs.
+        """
+        # Draw all grid sizes at once, and build each distinct grid once
+        n_grid_arr = self.draw_n_grid(size=n_f)
+        x_path_list = [
+            linspace_column(self.min_x_path, self.max_x_path, int(n_grid))
+            for n_grid in n_grid_arr
+        ]
+
+        # Step through all grids together, one call to f_list per step, keeping each
+        # function's outputs (as returned by f_list) in its own list
+        y_list_list = [[] for _ in range(n_f)]
+        len_max = max((len(x_path) for x_path in x_path_list), default=0)
+        for i in range(len_max):
+            x_list = [x_path[i] if i < len(x_path) else None for x_path in x_path_list]
+            y_list = f_list(x_list)
+            for x, y, y_list_f in zip(x_list, y_list, y_list_list):
+                if x is not None:
+                    y_list_f.append(y)
+
+        return self.get_exe_path_and_output_lists(x_path_list, y_list_list)
 
 
 class AverageOutputs(FixedPathAlgorithm):
@@ -192,9 +424,10 @@ class AverageOutputs(FixedPathAlgorithm):
 
         self.params.name = getattr(params, "name", "AverageOutputs")
 
+    @cache_output
     def get_output(self):
         """Return output based on self.exe_path."""
-        return np.mean(self.exe_path.y)
+        return float(np.mean(self.exe_path.y))
 
 
 class SortOutputs(FixedPathAlgorithm):
@@ -232,6 +465,83 @@ class OptRightScan(Algorithm):
         self.params.max_iter = getattr(params, "max_iter", 100)
         self.params.crop_str = getattr(params, "crop_str", "min")
 
+    def initialize(self):
+        """Initialize algorithm, reset execution path and running min of outputs."""
+        super().initialize()
+        self.running_min = np.inf
+
+    def run_algorithm_on_f(self, f):
+        """
+        Run the algorithm by sequentially querying function f. Return the execution path
+        and output. If f is a Numba-compiled function returning a scalar and init_x is
+        one dimensional, run the compiled loop from numba_kernels.
+        """
+        self.initialize()
+
+        x_list = None
+        if is_numba_function(f) and len(self.params.init_x) == 1:
+            from numba.core.errors import TypingError
+            from .numba_kernels import opt_right_scan_loop
+
+            # Preallocate buffers for the longest possible execution path
+            len_max = self.params.max_iter + 2
+            x_buf = np.empty((len_max, 1))
+            y_buf = np.empty(len_max)
+
+            # Fall back to the Python loop if the kernel can't be compiled for f
+            # (e.g. if f returns an array)
+            try:
+                len_path = opt_right_scan_loop(
+                    f,
+                    float(self.params.init_x[0]),
+                    self.params.x_grid_gap,
+                    self.params.conv_thresh,
+                    self.params.max_iter,
+                    x_buf,
+                    y_buf,
+                )
+                if len_path >= 2:
+                    self.running_min = np.min(y_buf[: len_path - 1])
+                x_list = x_buf[:len_path].tolist()
+                y_list = y_buf[:len_path].tolist()
+            except TypingError:
+                pass
+
+        if x_list is None:
+            x_list, y_list = self.run_scan_loop(f)
+
+        # Set execution path once at the end
+        self.exe_path.x = x_list
+        self.exe_path.y = y_list
+
+        # Return execution path and output
+        return self.exe_path, self.get_output()
+
+    def run_scan_loop(self, f):
+        """
+        Scan to the right by querying function f. Return the lists of queried inputs and
+        outputs (as returned by f) in the execution path.
+        """
+        x_list = []
+        y_list = []
+        x = self.params.init_x
+        y_prev = np.inf
+        while True:
+            y = f(x)
+            x_list.append(x)
+            y_list.append(y)
+
+            # Stop once y exceeds min of previous values plus threshold, or at max_iter
+            self.running_min = min(self.running_min, y_prev)
+            conv_max_val = self.running_min + self.params.conv_thresh
+            if y > conv_max_val or len(x_list) > self.params.max_iter:
+                break
+
+            y_prev = y
+            x = [x[0] + self.params.x_grid_gap]
+
+        return x_list, y_list
+
     def get_next_x(self):
         """
         Given the current execution path, return the next x in the execution path. If
@@ -244,7 +554,8 @@ class OptRightScan(Algorithm):
             next_x = [self.exe_path.x[-1][0] + self.params.x_grid_gap]
 
         if len_path >= 2:
-            conv_max_val = np.min(self.exe_path.y[:-1]) + self.params.conv_thresh
+            self.running_min = min(self.running_min, self.exe_path.y[-2])
+            conv_max_val = self.running_min + self.params.conv_thresh
             if self.exe_path.y[-1] > conv_max_val:
                 next_x = None
 
@@ -348,7 +659,7 @@ class GlobalOptGrid(GlobalOptValGrid):
         elif self.params.opt_mode == "max":
             opt_idx = np.argmax(self.exe_path.y)
 
-        # Set opt_pair as [list, float]
+        # Set opt_pair as [array, float]
         opt_pair = [self.exe_path.x[opt_idx], self.exe_path.y[opt_idx]]
 
         return opt_pair
@@ -357,8 +668,8 @@ class GlobalOptGrid(GlobalOptValGrid):
         """Return distance function for pairs of outputs."""
 
         def dist_fn(a, b):
-            a = np.array(a[0] + [a[1]])
-            b = np.array(b[0] + [b[1]])
+            a = np.append(a[0], a[1])
+            b = np.append(b[0], b[1])
             return np.linalg.norm(a - b)
 
         return dist_fn
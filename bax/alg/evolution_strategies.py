@@ -59,6 +59,11 @@ class EvolutionStrategies(Algorithm):
         #self.params.gen_list = [self.params.init_x]
         self.params.gen_list = []   # TODO: figure out initialization
 
+    def get_copy(self):
+        """Return a copy of this algorithm."""
+        # Deep copy, since self.params holds mutable sampler state
+        return copy.deepcopy(self)
+
     def get_next_x(self):
         """
         Given the current execution path, return the next x in the execution path. If
@@ -0,0 +1,59 @@
+"""
+Numba-compiled kernels for BAX algorithms, used when the queried function is itself a
+Numba-compiled function. Kernels take that function as an argument and are compiled
+once per function, so they are not cached to disk.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit
+def fixed_path_scan(f_jit, x_path, f_vals_out):
+    """
+    Query Numba-compiled function f_jit on each row of 2D array x_path, writing function
+    values into f_vals_out.
+    """
+    for i in range(x_path.shape[0]):
+        f_vals_out[i] = f_jit(x_path[i])
+
+
+@njit(parallel=True)
+def fixed_path_scan_batch(f_jit, x_path, f_vals_out):
+    """
+    Query Numba-compiled function f_jit, where f_jit(b, x) returns the value of function
+    b at input x, on each row of 2D array x_path for each function b. Write function
+    values into 2D array f_vals_out (one row per function), in parallel over functions.
+    """
+    for b in prange(f_vals_out.shape[0]):
+        for i in range(x_path.shape[0]):
+            f_vals_out[b, i] = f_jit(b, x_path[i])
+
+
+@njit
+def opt_right_scan_loop(f_jit, init_x0, gap, thresh, max_iter, x_buf, y_buf):
+    """
+    Run the OptRightScan loop on Numba-compiled function f_jit (which takes a length-1
+    array and returns a float), starting from scalar init_x0. Write inputs into 2D
+    array x_buf and function values into y_buf, which must both have length at least
+    max_iter + 2, and return the length of the execution path.
+    """
+    x = init_x0
+    running_min = np.inf
+    y_prev = np.inf
+    n = 0
+    while True:
+        x_buf[n, 0] = x
+        y = f_jit(x_buf[n])
+        y_buf[n] = y
+        n += 1
+
+        # Stop once y exceeds min of previous values plus threshold, or at max_iter
+        running_min = min(running_min, y_prev)
+        if (y > running_min + thresh) | (n > max_iter):
+            break
+
+        y_prev = y
+        x += gap
+
+    return n
@@ -3,7 +3,6 @@ Base classes.
 """
 
 from argparse import Namespace
-import copy
 
 from .misc_util import dict_to_namespace
 
@@ -41,8 +40,8 @@ class Base:
 
     def set_print_params(self):
         """Set self.print_params."""
-        if not hasattr(self, 'print_params'):
-            self.print_params = copy.deepcopy(self.params)
+        # Shallow copy, so that subclasses can delete fields without deep copying
+        self.print_params = Namespace(**vars(self.params))
 
     def __str__(self):
         self.set_print_params()
@@ -2,6 +2,7 @@
 Utilities for domains (search spaces).
 """
 
+from functools import lru_cache
 import numpy as np
 
 
@@ -19,3 +20,14 @@ def project_to_domain(x, domain):
     max_list = [tup[1] for tup in domain]
     x_arr_clip = np.clip(x_arr, min_list, max_list)
     return list(x_arr_clip)
+
+
+@lru_cache(maxsize=128)
+def linspace_column(lo, hi, n):
+    """
+    Return a read-only (n, 1) array of n evenly spaced points from lo to hi. Results are
+    memoized, so callers must not modify the returned array.
+    """
+    x_arr = np.linspace(lo, hi, n).reshape(-1, 1)
+    x_arr.flags.writeable = False
+    return x_arr
@@ -27,6 +27,17 @@ def dict_to_namespace(params):
     return params
 
 
+def is_numba_function(f):
+    """Return True if f is a Numba-compiled function (i.e. the output of numba.njit)."""
+    # Only import numba (an optional dependency) if f comes from numba
+    if not type(f).__module__.startswith("numba."):
+        return False
+
+    from numba.core.registry import CPUDispatcher
+
+    return isinstance(f, CPUDispatcher)
+
+
 class suppress_stdout_stderr:
     """
     A context manager for doing a "deep suppression" of stdout and stderr in
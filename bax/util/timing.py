@@ -2,7 +2,8 @@
 Timing utilities.
 """
 
-import time
+from time import perf_counter
+import atexit
 import datetime
 
 
@@ -11,20 +12,41 @@ class Timer(object):
     Timer class. Thanks to Eli Bendersky, Josiah Yoder, Jonas Adler, Can Kavaklıoğlu,
     and others from https://stackoverflow.com/a/50957722.
     """
+
+    # Open log files, shared by all Timers and closed at exit
+    open_files = {}
+
     def __init__(self, name=None, filename=None, verbose=True):
         self.name = name
         self.filename = filename
         self.verbose = verbose
 
     def __enter__(self):
-        self.tstart = time.time()
+        self.tstart = perf_counter()
 
     def __exit__(self, type, value, traceback):
-        message = 'Elapsed: %.2f seconds' % (time.time() - self.tstart)
+        message = 'Elapsed: %.2f seconds' % (perf_counter() - self.tstart)
         if self.name:
             message = '*[TIME] [%s] ' % self.name + message
         if self.verbose:
             print(message)
         if self.filename:
-            with open(self.filename,'a') as file:
-                print(str(datetime.datetime.now())+": ",message,file=file)
+            file = self.get_file(self.filename)
+            file.write(str(datetime.datetime.now()) + ":  " + message + "\n")
+
+    @classmethod
+    def get_file(cls, filename):
+        """Return a buffered handle for appending to filename, opening it once."""
+        if filename not in cls.open_files:
+            cls.open_files[filename] = open(filename, 'a', buffering=8192)
+        return cls.open_files[filename]
+
+    @classmethod
+    def close_files(cls):
+        """Close all log files opened by Timers."""
+        for file in cls.open_files.values():
+            file.close()
+        cls.open_files.clear()
+
+
+atexit.register(Timer.close_files)
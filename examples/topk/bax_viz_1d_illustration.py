@@ -29,7 +29,7 @@ f = lambda x: 2 * np.sin(x[0])
 min_x = 3.5
 max_x = 20.0
 len_path = 20
-x_path = [[x] for x in np.random.uniform(min_x, max_x, len_path)]
+x_path = np.random.uniform(min_x, max_x, len_path).reshape(-1, 1)
 algo = TopK({"x_path": x_path, "k": 2})
 
 # Set data for model